@@ -4,39 +4,220 @@
 # See https://github.com/marzer/check-cmake/blob/main/LICENSE.txt for the full license text.
 # SPDX-License-Identifier: MIT
 
+import bisect
+import functools
 import re
-from io import StringIO
 from pathlib import Path
-from typing import Collection, List, Tuple, Union
+from typing import Collection, List, Optional, Tuple, Union
 
 import colorama
 
 from . import utils
 from .grid import Grid
 
+try:
+    from re import _parser as _sre_parse
+except ImportError:
+    import sre_parse as _sre_parse  # python < 3.11
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import pcre2
+except ImportError:
+    pcre2 = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 INDENT = '  '
 
 BS = '\\'
 
 
+# patterns are compiled (and parsed for their literal prefixes) once per distinct pattern and flags, no matter how
+# many checks use them or how many times checks are constructed
+@functools.lru_cache(maxsize=None)
+def _compile(pattern: str, flags: int = 0):
+    return re.compile(pattern, flags=int(flags) | re.DOTALL)
+
+
+_ESCAPE_OR_CLASS_RE = re.compile(r'\\.|\[\^?\]?(?:\\.|[^\]\\])*\]', flags=re.DOTALL)
+
+_ESCAPE_RE = re.compile(r'\\.', flags=re.DOTALL)
+
+
+@functools.lru_cache(maxsize=None)
+def _python_whitespace(pattern: str) -> str:
+    # python's \s also matches \x0b and \x1c-\x1f, which other engines' \s doesn't (even though they're ASCII),
+    # so patterns handed to those engines have it spelled out. raises ValueError for \S inside a character class,
+    # which can't be spelled out
+    def widen_escape(m: re.Match) -> str:
+        if m[0] == r'\S':
+            raise ValueError(rf'cannot rewrite \S in a character class: {pattern}')
+        return r'\s\x0b\x1c-\x1f' if m[0] == r'\s' else m[0]
+
+    def widen(m: re.Match) -> str:
+        if m[0] == r'\s':
+            return r'[\s\x0b\x1c-\x1f]'
+        if m[0] == r'\S':
+            return r'[^\s\x0b\x1c-\x1f]'
+        if m[0].startswith('['):
+            return _ESCAPE_RE.sub(widen_escape, m[0])
+        return m[0]
+
+    return _ESCAPE_OR_CLASS_RE.sub(widen, pattern)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_re2(pattern: str):
+    # RE2 matches in linear time so it can't be pushed into catastrophic backtracking by malformed scripts.
+    # returns None if RE2 isn't installed or doesn't support the pattern
+    if re2 is None:
+        return None
+    options = re2.Options()
+    options.log_errors = False
+    try:
+        return re2.compile(rf'(?s){_python_whitespace(pattern)}', options)
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_pcre2(pattern: str):
+    # PCRE2 JIT-compiles patterns to native code.
+    # returns None if PCRE2 isn't installed or doesn't support the pattern
+    if pcre2 is None:
+        return None
+    try:
+        return pcre2.compile(_python_whitespace(pattern), flags=pcre2.DOTALL, jit=True)
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_ascii(pattern: str, flags: int = 0):
+    # RE2's and PCRE2's \b, \s and \w don't agree with re's outside of ASCII (RE2's are ASCII-only, and PCRE2's
+    # Unicode classes differ from python's for combining marks, connector punctuation, U+180E, etc.), so they're
+    # only used on text that's entirely ASCII (once \s is widened to match python's). patterns compiled here must
+    # only be used on that. neither supports every construct (or flag) that re does, so anything they reject
+    # falls back to re
+    if not int(flags) & ~re.DOTALL:
+        compiled = _compile_re2(pattern)
+        if compiled is None:
+            compiled = _compile_pcre2(pattern)
+        if compiled is not None:
+            return compiled
+    return _compile(pattern, flags=flags)
+
+
+@functools.lru_cache(maxsize=None)
+def _literal_prefix(pattern: str, flags: int = 0) -> str:
+    # the literal text every match of a pattern must begin with (or an empty string if there isn't any),
+    # so a quick substring test can rule the whole pattern out before running it
+    prefix = []
+
+    def walk(items) -> bool:
+        for op, av in items:
+            if op is _sre_parse.AT and not prefix:
+                continue
+            if op is _sre_parse.LITERAL:
+                prefix.append(chr(av))
+                continue
+            if op is _sre_parse.SUBPATTERN and not av[1] and not av[2]:
+                if not walk(av[3]):
+                    return False
+                continue
+            return False
+        return True
+
+    try:
+        parsed = _sre_parse.parse(pattern, int(flags))
+        if parsed.state.flags & re.IGNORECASE:
+            return ''
+        walk(parsed)
+    except Exception:
+        return ''
+    return ''.join(prefix)
+
+
+@functools.lru_cache(maxsize=None)
+def _can_splice(pattern: str, flags: int = 0) -> bool:
+    # whether a pattern's text can be pasted into a larger alternation and still mean the same thing; it can't
+    # if it has a top-level | (anything hoisted out in front of it would only apply to the first branch),
+    # or refers back to any groups by number (they'd be numbered from the start of the larger pattern)
+    def has_groupref(items) -> bool:
+        for op, av in items:
+            if op in (_sre_parse.GROUPREF, _sre_parse.GROUPREF_EXISTS):
+                return True
+            for arg in av if isinstance(av, (tuple, list)) else ():
+                if isinstance(arg, _sre_parse.SubPattern) and has_groupref(arg):
+                    return True
+                if isinstance(arg, list) and any(has_groupref(sub) for sub in arg):
+                    return True
+        return False
+
+    try:
+        parsed = _sre_parse.parse(pattern, int(flags))
+    except Exception:
+        return False
+    if has_groupref(parsed):
+        return False
+    # the parser flattens non-capturing groups, so top-level branches are looked for in the text itself
+    depth = 0
+    for c in _ESCAPE_OR_CLASS_RE.sub('', pattern):
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == '|' and not depth:
+            return False
+    return True
+
+
+_IDENT_RE = re.compile(r'[a-z_]+')
+
+_CMAKE_FUNC_PREFIX_RE = re.compile(r'(?:set_|target_|find_|project)')
+
+_TRAILING_PARENS_RE = re.compile(r'\(\s*\)\s*$')
+
+
+@functools.lru_cache(maxsize=512)
+def _derive_link_description(uri: str) -> Optional[str]:
+    last_slash = uri.rfind('/')
+    last_dot = uri.rfind('.')
+    if last_slash == -1 or last_dot == -1 or last_dot < last_slash:
+        return None
+    description = uri[last_slash + 1 : last_dot]
+    if (
+        _IDENT_RE.fullmatch(description)
+        and _CMAKE_FUNC_PREFIX_RE.match(description)
+        and not _TRAILING_PARENS_RE.search(description)
+    ):
+        description += '()'
+    return description
+
+
 class Link(object):
+    __slots__ = ('uri', '__description', '__derive_description')
+
     def __init__(self, uri, description=None):
         self.uri = str(uri)
-        self.description = description
-        if self.description is not None:
-            self.description = str(self.description)
-        else:
-            last_slash = self.uri.rfind('/')
-            last_dot = self.uri.rfind('.')
-            if last_slash == -1 or last_dot == -1 or last_dot < last_slash:
-                return
-            self.description = self.uri[last_slash + 1 : last_dot]
-            if (
-                re.fullmatch('[a-z_]+', self.description)
-                and re.match('^(set_|target_|find_|project)', self.description)
-                and not re.match('\(\s*\)\s*$', self.description)
-            ):
-                self.description += '()'
+        self.__description = str(description) if description is not None else None
+        # most links are never printed in a given run, so a missing description isn't derived until it's needed
+        self.__derive_description = description is None
+
+    @property
+    def description(self) -> Optional[str]:
+        if self.__derive_description:
+            self.__description = _derive_link_description(self.uri)
+            self.__derive_description = False
+        return self.__description
 
     def __bool__(self):
         return bool(self.uri)
@@ -72,6 +253,8 @@ class Links(object):
 
 
 class Span(object):
+    __slots__ = ('start', 'length')
+
     def __init__(self, start: int, length: int = 1, end: int = None):
         self.start = int(start)
         assert self.start >= 0
@@ -91,21 +274,57 @@ class Span(object):
     def end(self) -> int:
         return self.start + self.length
 
-    def line_mask(self, text: str) -> int:
+    def lines(self, text: str, newlines: List[int] = None) -> range:
+        # the (1-based) numbers of the lines the span touches
         if not self.length or self.start >= len(text):
-            return 0
-        first = utils.calc_line_and_column(text, self.start)[0]
-        last = min(self.end, len(text)) - 1
-        last = utils.calc_line_and_column(text, last)[0] if last > first else first
-        mask = 0
-        for i in range(first, last + 1):
-            mask |= 1 << i
-        return mask
+            return range(0)
+        end = min(self.end, len(text)) - 1
+        if newlines is None:
+            first = text.count('\n', 0, self.start) + 1
+            last = first + text.count('\n', self.start, end)
+        else:
+            first = bisect.bisect_left(newlines, self.start) + 1
+            last = bisect.bisect_left(newlines, end) + 1
+        return range(first, last + 1)
+
+
+class Source(object):
+    def __init__(self, text: str):
+        self.text = text
+
+    @functools.cached_property
+    def newlines(self) -> List[int]:
+        return utils.find_newlines(self.text)
+
+    def find_first_char_on_line(self, pos: int) -> int:
+        return utils.find_first_char_on_line(self.text, pos, newlines=self.newlines)
+
+    def find_last_char_on_line(self, pos: int) -> int:
+        return utils.find_last_char_on_line(self.text, pos, newlines=self.newlines)
 
 
 class Issue(object):
+    __slots__ = (
+        'generator',
+        'source_path',
+        'source_text',
+        'description',
+        'span',
+        'context',
+        '__newlines',
+        '__line_and_column',
+        '__grid',
+    )
+
     def __init__(
-        self, generator, source_path: Path, source_text: str, span: Span, description: str = None, context: Span = None
+        self,
+        generator,
+        source_path: Path,
+        source_text: str,
+        span: Span,
+        description: str = None,
+        context: Span = None,
+        newlines: List[int] = None,
     ):
         assert generator is not None
         self.generator = generator
@@ -124,59 +343,60 @@ class Issue(object):
         assert self.context.start <= self.span.start
         assert self.context.end >= self.span.end
 
-        self.line_and_column = utils.calc_line_and_column(source_text, span.start)
-
-        self.grid = Grid(source_text[self.context.start : self.context.end], indent=INDENT * 2)
-        self.grid.line_number = utils.calc_line_and_column(source_text, context.start)[0]
-        grid_highlight_range = self.grid.find_range(source_text[self.span.start : self.span.end])
-        if grid_highlight_range is not None:
-            self.grid.style_range(
-                first_line=grid_highlight_range[0],
-                first_col=grid_highlight_range[1],
-                last_line=grid_highlight_range[2],
-                last_col=grid_highlight_range[3],
-                colour=colorama.Fore.RED,
-            )
-            self.grid.style_range(
-                first_line=grid_highlight_range[2],
-                first_col=grid_highlight_range[3] + 1,
-                last_line=99999,
-                last_col=99999,
-                style=colorama.Style.RESET_ALL,
+        # the line/column and context grid are only needed if the issue is actually printed
+        # (it may yet be suppressed by an 'ignore this line' pragma), so they're computed on demand
+        self.__newlines = newlines
+        self.__line_and_column = None
+        self.__grid = None
+
+    @property
+    def line_and_column(self) -> Tuple[int, int]:
+        if self.__line_and_column is None:
+            self.__line_and_column = utils.calc_line_and_column(
+                self.source_text, self.span.start, newlines=self.__newlines
             )
+        return self.__line_and_column
+
+    @property
+    def grid(self) -> Grid:
+        if self.__grid is None:
+            self.__grid = Grid(self.source_text[self.context.start : self.context.end], indent=INDENT * 2)
+            self.__grid.line_number = utils.calc_line_and_column(
+                self.source_text, self.context.start, newlines=self.__newlines
+            )[0]
+            if self.span:
+                # the span's position within the context is already known, so there's no need to search for it
+                start = self.span.start - self.context.start
+                end = self.span.end - self.context.start
+                self.__grid.style_range_by_offset(start, end, colour=colorama.Fore.RED)
+                self.__grid.style_range_by_offset(end, style=colorama.Style.RESET_ALL)
+        return self.__grid
 
     def __str__(self):
-        with StringIO() as buf:
-            buf.write('\n')
-            buf.write(colorama.Style.BRIGHT)
-            if self.source_path:
-                buf.write(f'{self.source_path}')
-            else:
-                buf.write(f'<file>')
-            buf.write(rf':{self.line_and_column[0]}:{self.line_and_column[1]}: {colorama.Style.RESET_ALL}')
-            if self.description is not None:
-                buf.write(self.description)
-            else:
-                buf.write(self.generator.description)
-            # buf.write(rf' [{self.generator.name}]')
-            if self.grid:
-                buf.write(f'\n{INDENT}{colorama.Style.BRIGHT}Context:{colorama.Style.RESET_ALL}\n{self.grid}')
-            if self.generator.replace_with:
-                buf.write(
-                    f'\n{INDENT}{colorama.Style.BRIGHT}Replace with:{colorama.Style.RESET_ALL}\n{INDENT*2}{self.generator.replace_with}'
-                )
-            if self.generator.example:
-                buf.write(
-                    f'\n{INDENT}{colorama.Style.BRIGHT}Example:{colorama.Style.RESET_ALL}\n{self.generator.example}'
-                )
-            if self.generator.more_info:
-                buf.write(f'\n{INDENT}{colorama.Style.BRIGHT}More information:{colorama.Style.RESET_ALL}')
-                for info in self.generator.more_info:
-                    buf.write(f'\n{INDENT*2}{info}')
-            return buf.getvalue().lstrip()
+        B = colorama.Style.BRIGHT
+        R = colorama.Style.RESET_ALL
+        I = INDENT
+        parts = [B]
+        parts.append(f'{self.source_path}' if self.source_path else '<file>')
+        parts.append(rf':{self.line_and_column[0]}:{self.line_and_column[1]}: {R}')
+        parts.append(self.description if self.description is not None else self.generator.description)
+        # parts.append(rf' [{self.generator.name}]')
+        if self.grid:
+            parts.append(f'\n{I}{B}Context:{R}\n{self.grid}')
+        if self.generator.replace_with:
+            parts.append(f'\n{I}{B}Replace with:{R}\n{I*2}{self.generator.replace_with}')
+        if self.generator.example:
+            parts.append(f'\n{I}{B}Example:{R}\n{self.generator.example}')
+        if self.generator.more_info:
+            parts.append(f'\n{I}{B}More information:{R}')
+            for info in self.generator.more_info:
+                parts.append(f'\n{I*2}{info}')
+        return ''.join(parts)
 
 
 class Check(object):
+    __slots__ = ('__name', '__description', '__replace_with', '__example', '__more_info', '__required_literal')
+
     def __init__(
         self,
         name: str,
@@ -184,6 +404,7 @@ class Check(object):
         replace_with: Union[str, Link] = None,
         example: Union[str, Grid] = None,
         more_info: Union[str, Link, Collection[Union[str, Link]]] = None,
+        required_literal: str = None,
     ):
         assert name is not None
         self.__name = str(name).strip()
@@ -204,13 +425,19 @@ class Check(object):
 
         self.__more_info = None
         if more_info is not None:
-            self.__more_info = [i for i in list(utils.coerce_collection(more_info)) if i]
-            for i in range(len(self.__more_info)):
-                if not isinstance(self.__more_info[i], Link):
-                    self.__more_info[i] = Link(str(self.__more_info[i]))
-            self.__more_info = tuple(self.__more_info) if self.__more_info else None
+            if not isinstance(more_info, (tuple, list)):
+                more_info = utils.coerce_collection(more_info)
+            self.__more_info = tuple(i if isinstance(i, Link) else Link(str(i)) for i in more_info if i) or None
+
+        self.__required_literal = str(required_literal) if required_literal else None
+
+    def __call__(self, source_path: Path, source: Source) -> Union[Issue, List[Issue]]:
+        # str.__contains__ is a fast C-level scan, far cheaper than running a check that can't possibly match
+        if self.__required_literal is not None and self.__required_literal not in source.text:
+            return None
+        return self._check(source_path, source)
 
-    def __call__(self, source_path: Path, source_text: str) -> Union[Issue, List[Issue]]:
+    def _check(self, source_path: Path, source: Source) -> Union[Issue, List[Issue]]:
         raise Exception('not implemented')
 
     @property
@@ -233,8 +460,33 @@ class Check(object):
     def more_info(self) -> Tuple[Link]:
         return self.__more_info
 
+    @property
+    def required_literal(self) -> str:
+        return self.__required_literal
+
+
+_BACKREF_RE = re.compile(r'\\([0-9])')
+
+# \bWORD\b or \b(?:WORD|WORD|...)\b
+_KEYWORDS_RE = re.compile(r'\\b(?:\(\?:(\w+(?:\|\w+)*)\)|(\w+))\\b')
+
 
 class RegexCheck(Check):
+    __slots__ = (
+        '_id',
+        '_description_templates',
+        '_flags',
+        '_pattern_strings',
+        '_patterns',
+        '_ascii_patterns',
+        '_pattern_literals',
+        '_inner_group_indices',
+        '_inner_group_must_match',
+        '_inner_group_must_match_ascii',
+        '_inner_group_must_match_literals',
+    )
+    __next_id = 0
+
     def __init__(
         self,
         name: str,
@@ -246,64 +498,333 @@ class RegexCheck(Check):
         flags: int = 0,
         inner_group_index: int = 1,
         inner_group_must_match: str = None,
+        required_literal: str = None,
     ):
-        super().__init__(name, description, replace_with=replace_with, example=example, more_info=more_info)
+        super().__init__(
+            name,
+            description,
+            replace_with=replace_with,
+            example=example,
+            more_info=more_info,
+            required_literal=required_literal,
+        )
 
-        self._description_has_group_placeholders = re.search(r'\\[0-9]', self.description)
+        self._id = RegexCheck.__next_id
+        RegexCheck.__next_id += 1
 
         assert pattern is not None
-        pattern = utils.coerce_collection(pattern)
+        if not isinstance(pattern, (tuple, list)):
+            pattern = utils.coerce_collection(pattern)
         assert pattern
-        self._patterns = []
-        for p in pattern:
-            p = str(p)
-            if p:
-                self._patterns.append(re.compile(p, flags=int(flags) | re.DOTALL))
-        self._patterns = tuple(self._patterns)
+        self._flags = int(flags)
+        self._pattern_strings = tuple(str(p) for p in pattern if str(p))
+        self._patterns = tuple(_compile(p, flags=flags) for p in self._pattern_strings)
         assert self._patterns
+        self._ascii_patterns = tuple(_compile_ascii(p, flags=flags) for p in self._pattern_strings)
+        self._pattern_literals = tuple(_literal_prefix(p, flags=flags) for p in self._pattern_strings)
 
-        self._inner_group_index = int(inner_group_index)
+        # the group to highlight is resolved against each pattern's group count here, once, rather than for each
+        # match; patterns without enough groups fall back to highlighting the whole match
+        inner_group_index = int(inner_group_index)
+        self._inner_group_indices = tuple(
+            inner_group_index if 0 <= inner_group_index <= p.groups else 0 for p in self._patterns
+        )
+
+        # descriptions with \N group placeholders are split up-front into literal text and group indices, so
+        # expanding them for each issue is just a join. this is per-pattern because placeholders for groups
+        # a pattern doesn't have are left as-is
+        self._description_templates = None
+        if _BACKREF_RE.search(self.description):
+            pieces = _BACKREF_RE.split(self.description)  # text, group, text, group, ..., text
+            self._description_templates = tuple(
+                tuple(
+                    (int(piece) if int(piece) <= p.groups else rf'{BS}{piece}') if i % 2 else piece
+                    for i, piece in enumerate(pieces)
+                )
+                for p in self._patterns
+            )
 
         self._inner_group_must_match = None
+        self._inner_group_must_match_ascii = None
+        self._inner_group_must_match_literals = None
         if inner_group_must_match is not None and bool(inner_group_must_match):
-            self._inner_group_must_match = re.compile(str(inner_group_must_match), flags=int(flags) | re.DOTALL)
+            self._inner_group_must_match = _compile(str(inner_group_must_match), flags=flags)
+            self._inner_group_must_match_ascii = _compile_ascii(str(inner_group_must_match), flags=flags)
+            # whole-word keyword lists can't match unless one of the keywords is a substring of the group,
+            # which is much cheaper to test than running the regex (it's still needed to check the word boundaries)
+            keywords = _KEYWORDS_RE.fullmatch(str(inner_group_must_match))
+            if keywords and not self._flags & re.IGNORECASE:
+                self._inner_group_must_match_literals = tuple((keywords[1] or keywords[2]).split('|'))
 
-    def __call__(self, source_path: Path, source_text: str) -> List[Issue]:
+    def _find_matches(self, source_text: str, ruled_out: Collection[str] = ()) -> List[List[re.Match]]:
+        patterns = self._ascii_patterns if source_text.isascii() else self._patterns
+        return [
+            (
+                list(pattern.finditer(source_text))
+                if literal in source_text and rf'chk_{self._id}_{i}' not in ruled_out
+                else []
+            )
+            for i, (pattern, literal) in enumerate(zip(patterns, self._pattern_literals))
+        ]
+
+    def _check(self, source_path: Path, source: Source) -> List[Issue]:
+        return self._make_issues(source_path, source, self._find_matches(source.text))
+
+    def _make_issues(self, source_path: Path, source: Source, matches: List[List[re.Match]]) -> List[Issue]:
         results = []
-        for pattern in self._patterns:
-            for m in pattern.finditer(source_text):
-                inner_group_index = self._inner_group_index
-                try:
-                    m[inner_group_index]
-                except IndexError:
-                    inner_group_index = 0
-                if self._inner_group_must_match is not None:
-                    m2 = self._inner_group_must_match.search(str(m[inner_group_index]))
-                    if m2:
+        # everything the loop needs is looked up once up-front rather than once per match
+        append = results.append
+        default_description = self.description
+        source_text = source.text
+        must_match = self._inner_group_must_match_ascii if source_text.isascii() else self._inner_group_must_match
+        must_match_literals = self._inner_group_must_match_literals
+        newlines = source.newlines
+        find_first_char_on_line = source.find_first_char_on_line
+        find_last_char_on_line = source.find_last_char_on_line
+        templates = self._description_templates or (None,) * len(self._patterns)
+        for inner_group_index, template, matches in zip(self._inner_group_indices, templates, matches):
+            for m in matches:
+                if must_match is not None:
+                    inner = str(m[inner_group_index])
+                    if (
+                        must_match_literals is None or any(k in inner for k in must_match_literals)
+                    ) and must_match.search(inner):
                         continue
-                description = self.description
-                if self._description_has_group_placeholders:
-                    for i in range(10):
-                        try:
-                            description = description.replace(f'\\{i}', str(m[i]))
-                        except IndexError:
-                            pass
-                results.append(
+                description = default_description
+                if template is not None:
+                    description = ''.join(str(m[t]) if isinstance(t, int) else t for t in template)
+                append(
                     Issue(
                         generator=self,
                         source_path=source_path,
                         source_text=source_text,
+                        newlines=newlines,
                         description=description,
                         span=Span(m.start(inner_group_index), end=m.end(inner_group_index)),
-                        context=Span(
-                            utils.find_first_char_on_line(source_text, m.start(0)),
-                            end=utils.find_last_char_on_line(source_text, m.end(0) - 1) + 1,
-                        ),
+                        context=Span(find_first_char_on_line(m.start(0)), end=find_last_char_on_line(m.end(0) - 1) + 1),
                     )
                 )
         return results
 
 
+class CompositeRegexCheck(Check):
+    # runs a number of RegexChecks together so a file only needs to be scanned once for all of them:
+    #  - every pattern that can be is folded into a single zero-width alternation; the lookahead means a match
+    #    doesn't consume any text, so overlapping matches from different checks are still found
+    #    (e.g. use_threads_package inside a target_link_libraries() missing a scope)
+    #  - if hyperscan (or failing that, RE2) is available, all of the patterns are first run over the file together
+    #    in a single pass to find out which of them can't possibly match it (RE2 only for files that are all ASCII)
+    __slots__ = (
+        '__members',
+        '__union',
+        '__union_names',
+        '__union_order',
+        '__union_members',
+        '__union_literals',
+        '__union_check_ids',
+        '__prefilter',
+        '__prefilter_names',
+    )
+
+    def __init__(self, *members: RegexCheck):
+        assert members
+        assert all(isinstance(m, RegexCheck) for m in members)
+        super().__init__(r'regex_checks', ', '.join(m.name for m in members))
+        self.__members = members
+        self.__build_union()
+        self.__build_prefilter()
+
+    def __build_union(self):
+        self.__union = None
+        self.__union_names = []
+        self.__union_order = dict()
+        self.__union_members = dict()
+        self.__union_literals = dict()
+        self.__union_check_ids = set()
+        word_start = []
+        other = []
+        for check in self.__members:
+            # patterns with flags beyond DOTALL would need them applied to the whole union, so leave them standalone.
+            # checks with RE2 or PCRE2 patterns are also left standalone; separate scans with either are already faster
+            # than the union, and RE2 in particular is very slow to re-match at each candidate (it re-encodes the text
+            # every call). RE2 and PCRE2 are only used on ASCII text, so on anything else these fall back to their own
+            # re scans.
+            # patterns that can't be pasted into the union without changing what they match are left standalone too
+            if (
+                check._flags & ~re.DOTALL
+                or not all(isinstance(p, re.Pattern) for p in check._ascii_patterns)
+                or not all(_can_splice(p, flags=check._flags) for p in check._pattern_strings)
+            ):
+                continue
+            self.__union_check_ids.add(check._id)
+            for i, (pattern, pattern_string) in enumerate(zip(check._patterns, check._pattern_strings)):
+                name = rf'chk_{check._id}_{i}'
+                self.__union_members[name] = pattern
+                self.__union_literals[name] = check._pattern_literals[i]
+                # most patterns start with a \b; hoisting it out in front of them lets the engine reject
+                # positions that aren't at a word boundary with a single test instead of one per pattern
+                if pattern_string.startswith(r'\b'):
+                    word_start.append((name, pattern_string[2:]))
+                else:
+                    other.append((name, pattern_string))
+        for name, _ in word_start + other:
+            self.__union_order[name] = len(self.__union_names)
+            self.__union_names.append(name)
+        alternatives = []
+        if word_start:
+            alternatives.append(rf'\b(?:{"|".join(rf"(?P<{n}>{p})" for n, p in word_start)})')
+        alternatives += [rf'(?P<{n}>{p})' for n, p in other]
+        if alternatives:
+            self.__union = re.compile(rf'(?=(?:{"|".join(alternatives)}))', flags=re.DOTALL)
+
+    def __build_prefilter(self):
+        # the prefilter is a function taking the source text and returning the indices (into __prefilter_names)
+        # of the patterns that might match it; patterns it doesn't know about are never ruled out
+        self.__prefilter = None
+        self.__prefilter_names = []
+        if hyperscan is not None:
+            self.__build_hyperscan_prefilter()
+        elif re2 is not None:
+            self.__build_re2_prefilter()
+
+    def __build_hyperscan_prefilter(self):
+        # hyperscan can't report capture groups (which the issue spans and descriptions need), but prefilter mode
+        # approximates any constructs it doesn't support with something looser. its \s doesn't match \x1c-\x1f
+        # though, so that's spelled out for it; patterns that can't be rewritten are left out (and never ruled out)
+        expressions = []
+        flags = []
+        for check in self.__members:
+            if check._flags & ~(re.DOTALL | re.IGNORECASE | re.MULTILINE):
+                continue
+            hs_flags = (
+                hyperscan.HS_FLAG_DOTALL
+                | hyperscan.HS_FLAG_SINGLEMATCH
+                | hyperscan.HS_FLAG_PREFILTER
+                | hyperscan.HS_FLAG_UTF8
+                | hyperscan.HS_FLAG_UCP
+            )
+            if check._flags & re.IGNORECASE:
+                hs_flags |= hyperscan.HS_FLAG_CASELESS
+            if check._flags & re.MULTILINE:
+                hs_flags |= hyperscan.HS_FLAG_MULTILINE
+            for i, pattern_string in enumerate(check._pattern_strings):
+                try:
+                    expression = _python_whitespace(pattern_string).encode('utf-8')
+                except ValueError:
+                    continue
+                self.__prefilter_names.append(rf'chk_{check._id}_{i}')
+                expressions.append(expression)
+                flags.append(hs_flags)
+        if not expressions:
+            return
+        try:
+            db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            db.compile(
+                expressions=expressions, ids=list(range(len(expressions))), elements=len(expressions), flags=flags
+            )
+        except Exception:
+            self.__prefilter_names = []
+            return
+
+        def scan(source_text: str) -> List[int]:
+            hits = []
+            db.scan(
+                source_text.encode('utf-8'), match_event_handler=lambda i, start, end, flags, context: hits.append(i)
+            )
+            return hits
+
+        self.__prefilter = scan
+
+    def __build_re2_prefilter(self):
+        # an RE2 set runs all the patterns it could compile together in one linear-time pass, but only reports
+        # which of them matched (not where), so it's only good for ruling patterns out
+        options = re2.Options()
+        options.log_errors = False
+        options.never_capture = True
+        patterns = re2.Set.SearchSet(options)
+        for check in self.__members:
+            if check._flags & ~(re.DOTALL | re.IGNORECASE | re.MULTILINE):
+                continue
+            mode = rf'(?s{"i" if check._flags & re.IGNORECASE else ""}{"m" if check._flags & re.MULTILINE else ""})'
+            for i, pattern_string in enumerate(check._pattern_strings):
+                try:
+                    index = patterns.Add(rf'{mode}{_python_whitespace(pattern_string)}')
+                except Exception:
+                    continue
+                assert index == len(self.__prefilter_names)
+                self.__prefilter_names.append(rf'chk_{check._id}_{i}')
+        if not self.__prefilter_names:
+            return
+        try:
+            patterns.Compile()
+        except Exception:
+            self.__prefilter_names = []
+            return
+        everything = range(len(self.__prefilter_names))
+
+        def match(source_text: str):
+            # RE2's \b, \s and \w are ASCII-only where re's follow Unicode, so the set would rule out patterns
+            # that actually match non-ASCII text (the patterns in it have \s widened, same as _compile_ascii())
+            if not source_text.isascii():
+                return everything
+            return patterns.Match(source_text) or ()
+
+        self.__prefilter = match
+
+    def __find_ruled_out(self, source_text: str) -> set:
+        if self.__prefilter is None:
+            return set()
+        ruled_out = set(self.__prefilter_names)
+        try:
+            for i in self.__prefilter(source_text):
+                ruled_out.discard(self.__prefilter_names[i])
+        except Exception:
+            ruled_out = set()  # e.g. lone surrogates that can't be encoded; just run everything
+        return ruled_out
+
+    def __find_union_matches(self, source_text: str, ruled_out: Collection[str]) -> dict:
+        matches = {name: [] for name in self.__union_names}
+        ends = {name: 0 for name in self.__union_names}
+        # patterns whose literal prefix doesn't appear anywhere in the text can't match it, nor can any the
+        # prefilter (if available) has ruled out
+        live = {
+            name for name in self.__union_names if self.__union_literals[name] in source_text and name not in ruled_out
+        }
+        for m in self.__union.finditer(source_text) if live else ():
+            pos = m.start()
+            # alternatives before the one reported in lastgroup have already failed at this position,
+            # but the ones after it haven't been tried yet
+            for name in self.__union_names[self.__union_order[m.lastgroup] :]:
+                # mimic finditer() by not letting a pattern match inside its own previous match
+                if name not in live or ends[name] > pos:
+                    continue
+                sub = self.__union_members[name].match(source_text, pos)
+                if sub is None:
+                    continue
+                matches[name].append(sub)
+                ends[name] = sub.end()
+        return matches
+
+    def _check(self, source_path: Path, source: Source) -> List[Issue]:
+        ruled_out = self.__find_ruled_out(source.text)
+        union_matches = self.__find_union_matches(source.text, ruled_out) if self.__union is not None else None
+        # issues are returned grouped by member, in order, same as if each member had been run separately
+        results = []
+        for check in self.__members:
+            if check.required_literal is not None and check.required_literal not in source.text:
+                continue
+            if check._id in self.__union_check_ids:
+                matches = [union_matches[rf'chk_{check._id}_{i}'] for i in range(len(check._patterns))]
+            else:
+                matches = check._find_matches(source.text, ruled_out)
+            results += check._make_issues(source_path, source, matches)
+        return results
+
+    @property
+    def members(self) -> Tuple[RegexCheck]:
+        return self.__members
+
+
 # "not closing bracket"
 NCB = r'[^)]*?'
 
@@ -316,6 +837,8 @@ def emphasis(text):
 
 
 class SpecifyMinimumCMakeVersion(Check):
+    __slots__ = ('__find_project', '__find_min_required')
+
     def __init__(self):
         super().__init__(
             r'specify_minimum_cmake_version',
@@ -324,56 +847,60 @@ class SpecifyMinimumCMakeVersion(Check):
             more_info=Link(
                 r'https://cmake.org/cmake/help/latest/command/cmake_minimum_required.html', r'cmake_minimum_required()'
             ),
+            required_literal=r'project',
         )
-        self.__find_project = re.compile(rf'\b(project)\s*\(({NCB})\)', flags=re.DOTALL)
-        self.__find_min_required = re.compile(rf'\b(cmake_minimum_required)\s*\(({NCB})\)', flags=re.DOTALL)
+        self.__find_project = _compile(rf'\b(project)\s*\(({NCB})\)')
+        self.__find_min_required = _compile(rf'\b(cmake_minimum_required)\s*\(({NCB})\)')
 
-    def __call__(self, source_path: Path, source_text: str) -> Issue:
+    def _check(self, source_path: Path, source: Source) -> Issue:
         if source_path.name.lower() != 'cmakelists.txt':
             return None
-        project = self.__find_project.search(source_text)
+        project = self.__find_project.search(source.text)
         if not project:
             return None
-        min_required = self.__find_min_required.search(source_text)
+        min_required = self.__find_min_required.search(source.text)
         if not min_required:
             return Issue(
                 generator=self,
                 source_path=source_path,
-                source_text=source_text,
+                source_text=source.text,
+                newlines=source.newlines,
                 span=Span(project.start(1), end=project.end(1)),
                 context=Span(
-                    utils.find_first_char_on_line(source_text, project.start()),
-                    end=utils.find_last_char_on_line(source_text, project.end() - 1) + 1,
+                    source.find_first_char_on_line(project.start()),
+                    end=source.find_last_char_on_line(project.end() - 1) + 1,
                 ),
             )
         elif min_required.start() > project.start():
             return Issue(
                 generator=self,
                 source_path=source_path,
-                source_text=source_text,
+                source_text=source.text,
+                newlines=source.newlines,
                 span=Span(min_required.start(1), end=min_required.end(1)),
                 context=Span(
-                    utils.find_first_char_on_line(source_text, project.start()),
-                    end=utils.find_last_char_on_line(source_text, max(project.end(), min_required.end()) - 1) + 1,
+                    source.find_first_char_on_line(project.start()),
+                    end=source.find_last_char_on_line(max(project.end(), min_required.end()) - 1) + 1,
                 ),
             )
 
 
 class TargetIncludeDirectoriesSYSTEM(Check):
+    __slots__ = ('__tid_with_system', '__good_args')
+
     def __init__(self):
         super().__init__(
             r'target_include_directories_system',
             rf"the {emphasis('SYSTEM')} specifier must be the first non-target argument passed to {emphasis('target_include_directories()')}",
             example='target_include_directories(my_lib\n\tSYSTEM\n\tINTERFACE\n\t\t$<INSTALL_INTERFACE:include>\n)',
             more_info=Links.target_include_directories,
+            required_literal=r'SYSTEM',
         )
-        self.__tid_with_system = re.compile(
-            rf'\btarget_include_directories\s*\(({NCB}\b(SYSTEM)\b{NCB})\)', flags=re.DOTALL
-        )
-        self.__good_args = re.compile(rf'^\s*(?:[a-zA-Z0-9_-]+|"{NSTR}")\s+SYSTEM\s+.*?$', flags=re.DOTALL)
+        self.__tid_with_system = _compile(rf'\btarget_include_directories\s*\(({NCB}\b(SYSTEM)\b{NCB})\)')
+        self.__good_args = _compile(rf'^\s*(?:[a-zA-Z0-9_-]+|"{NSTR}")\s+SYSTEM\s+.*?$')
 
-    def __call__(self, source_path: Path, source_text: str) -> Issue:
-        tid = self.__tid_with_system.search(source_text)
+    def _check(self, source_path: Path, source: Source) -> Issue:
+        tid = self.__tid_with_system.search(source.text)
         if not tid:
             return None
         if self.__good_args.fullmatch(tid[1]):
@@ -381,11 +908,11 @@ class TargetIncludeDirectoriesSYSTEM(Check):
         return Issue(
             generator=self,
             source_path=source_path,
-            source_text=source_text,
+            source_text=source.text,
+            newlines=source.newlines,
             span=Span(tid.start(2), end=tid.end(2)),
             context=Span(
-                utils.find_first_char_on_line(source_text, tid.start()),
-                end=utils.find_last_char_on_line(source_text, tid.end() - 1) + 1,
+                source.find_first_char_on_line(tid.start()), end=source.find_last_char_on_line(tid.end() - 1) + 1
             ),
         )
 
@@ -393,105 +920,108 @@ class TargetIncludeDirectoriesSYSTEM(Check):
 CHECKS = (
     SpecifyMinimumCMakeVersion(),
     TargetIncludeDirectoriesSYSTEM(),
-    RegexCheck(
-        r'specify_project_version',
-        rf"{emphasis('project()')} should specify a {emphasis('VERSION')}",
-        rf'\bproject\s*\(({NCB})\)',
-        inner_group_must_match=r'\bVERSION\b',
-        more_info=Links.project,
-    ),
-    RegexCheck(
-        r'specify_scope_on_target_functions',
-        rf'{emphasis(BS+r"1()")} should specify at least one dependency scope '
-        rf'({emphasis("PRIVATE")}, {emphasis("INTERFACE")} or {emphasis("PUBLIC")}) ',
-        rf'\b(target_(?:link_(?:options|libraries)|compile_(?:options|features|definitions)|(?:include|link)_directories))\s*\(({NCB})\)',
-        inner_group_index=2,
-        inner_group_must_match=r'\b(?:PRIVATE|PUBLIC|INTERFACE)\b',
-        more_info=(Links.private_public_interface, Links.effective_modern_cmake),
-    ),
-    RegexCheck(
-        r'use_set_target_properties_rpath',
-        rf'rpaths should be set using {emphasis("set_target_properties()")} and {emphasis("INSTALL_RPATH")}',
-        r'(-Wl,-rpath=)',
-        replace_with=Links.set_target_properties,
-        example=r'''
+    CompositeRegexCheck(
+        RegexCheck(
+            r'specify_project_version',
+            rf"{emphasis('project()')} should specify a {emphasis('VERSION')}",
+            rf'\bproject\s*\(({NCB})\)',
+            inner_group_must_match=r'\bVERSION\b',
+            more_info=Links.project,
+        ),
+        RegexCheck(
+            r'specify_scope_on_target_functions',
+            rf'{emphasis(BS+r"1()")} should specify at least one dependency scope '
+            rf'({emphasis("PRIVATE")}, {emphasis("INTERFACE")} or {emphasis("PUBLIC")}) ',
+            rf'\b(target_(?:link_(?:options|libraries)|compile_(?:options|features|definitions)|(?:include|link)_directories))\s*\(({NCB})\)',
+            inner_group_index=2,
+            inner_group_must_match=r'\b(?:PRIVATE|PUBLIC|INTERFACE)\b',
+            more_info=(Links.private_public_interface, Links.effective_modern_cmake),
+        ),
+        RegexCheck(
+            r'use_set_target_properties_rpath',
+            rf'rpaths should be set using {emphasis("set_target_properties()")} and {emphasis("INSTALL_RPATH")}',
+            r'(-Wl,-rpath=)',
+            replace_with=Links.set_target_properties,
+            example=r'''
 get_target_property(my_current_rpaths my_lib INSTALL_RPATH)
 list(APPEND my_current_rpaths "/opt/lib")
 set_target_properties(my_lib PROPERTIES INSTALL_RPATH "${my_current_rpaths}")
 ''',
-        more_info=r'https://cmake.org/cmake/help/latest/prop_tgt/INSTALL_RPATH.html',
-    ),
-    RegexCheck(
-        r'use_set_target_properties_pic',
-        rf'position-independent code should be set per-target using {emphasis("set_target_properties()")} and {emphasis("POSITION_INDEPENDENT_CODE")}',
-        rf'\bset\s*\({NCB}\b(CMAKE_POSITION_INDEPENDENT_CODE)\b{NCB}\)',
-        replace_with=Links.set_target_properties,
-        example=r'set_target_properties(my_lib PROPERTIES POSITION_INDEPENDENT_CODE ON)',
-        more_info=r'https://cmake.org/cmake/help/latest/prop_tgt/POSITION_INDEPENDENT_CODE.html',
-    ),
-    RegexCheck(
-        r'use_target_compile_definitions',
-        rf'compiler defines should be set on a per-target basis using {emphasis("target_compile_definitions()")}',
-        rf'\b(add_(?:compile_)?definitions)\s*\({NCB}\)',
-        replace_with=Links.target_compile_definitions,
-        more_info=Links.effective_modern_cmake,
-    ),
-    RegexCheck(
-        r'use_target_compile_features_language_standard',
-        rf'language standard level should be set on a per-target basis using {emphasis("target_compile_features()")}',
-        (
-            rf'\bset_target_properties\s*\({NCB}\b(C(?:XX)?_STANDARD)\b{NCB}\)',
-            rf'\bset\s*\(\s*\b(CMAKE_C(?:XX)?_STANDARD)\b{NCB}\)',
+            more_info=r'https://cmake.org/cmake/help/latest/prop_tgt/INSTALL_RPATH.html',
+        ),
+        RegexCheck(
+            r'use_set_target_properties_pic',
+            rf'position-independent code should be set per-target using {emphasis("set_target_properties()")} and {emphasis("POSITION_INDEPENDENT_CODE")}',
+            rf'\bset\s*\({NCB}\b(CMAKE_POSITION_INDEPENDENT_CODE)\b{NCB}\)',
+            replace_with=Links.set_target_properties,
+            example=r'set_target_properties(my_lib PROPERTIES POSITION_INDEPENDENT_CODE ON)',
+            more_info=r'https://cmake.org/cmake/help/latest/prop_tgt/POSITION_INDEPENDENT_CODE.html',
+        ),
+        RegexCheck(
+            r'use_target_compile_definitions',
+            rf'compiler defines should be set on a per-target basis using {emphasis("target_compile_definitions()")}',
+            rf'\b(add_(?:compile_)?definitions)\s*\({NCB}\)',
+            replace_with=Links.target_compile_definitions,
+            more_info=Links.effective_modern_cmake,
+        ),
+        RegexCheck(
+            r'use_target_compile_features_language_standard',
+            rf'language standard level should be set on a per-target basis using {emphasis("target_compile_features()")}',
+            (
+                rf'\bset_target_properties\s*\({NCB}\b(C(?:XX)?_STANDARD)\b{NCB}\)',
+                rf'\bset\s*\(\s*\b(CMAKE_C(?:XX)?_STANDARD)\b{NCB}\)',
+            ),
+            replace_with=Links.target_compile_features,
+            more_info=(Links.CMAKE_CXX_KNOWN_FEATURES, Links.CMAKE_C_KNOWN_FEATURES),
+        ),
+        RegexCheck(
+            r'use_target_compile_options',
+            rf'compiler options should be set on a per-target basis using {emphasis("target_compile_options()")}',
+            (rf'\b(add_compile_options)\s*\({NCB}\)', rf'\bset\s*\(\s*(CMAKE_C(?:XX)?_FLAGS)\b{NCB}\)'),
+            replace_with=Links.target_compile_options,
+            more_info=Links.effective_modern_cmake,
+        ),
+        RegexCheck(
+            r'use_target_include_directories',
+            rf'include paths should be set on a per-target basis using {emphasis("target_include_directories()")}',
+            rf'\b(include_directories)\s*\({NCB}\)',
+            replace_with=Links.target_include_directories,
+            more_info=Links.effective_modern_cmake,
+        ),
+        RegexCheck(
+            r'use_target_link_libraries',
+            rf'linker paths should be inherited from library targets using {emphasis("target_link_libraries()")}',
+            rf'\b(link_directories)\s*\({NCB}\)',
+            replace_with=Links.target_link_libraries,
+            more_info=Links.effective_modern_cmake,
+        ),
+        RegexCheck(
+            r'use_threads_package',
+            rf'support for threading should be provided by linking with {emphasis("Threads::Threads")} from the {emphasis("Threads")} package',
+            rf'\btarget_link_libraries\s*\({NCB}\b(pthread)\b{NCB}\)',
+            replace_with='Threads::Threads',
+            example=r'find_package(Threads REQUIRED)\ntarget_link_libraries(my_lib PUBLIC Threads::Threads)',
+            more_info=(r'https://cmake.org/cmake/help/latest/module/FindThreads.html', Links.find_package),
+        ),
+        RegexCheck(
+            r'external_project_add_cmake_args',
+            rf"{emphasis('ExternalProject_Add()')} variable definitions specified via {emphasis('CMAKE_ARGS')} must not"
+            + rf" have a space after {emphasis('-D')} (use quotes around the entire argument if the RHS might have whitespace)",
+            rf'\bExternalProject_Add\s*\({NCB}\s+CMAKE_ARGS\s+{NCB}(-D\s+[a-zA-Z0-9_]+=){NCB}\)',
+            example='\nExternalProject_Add(\n\tsome_lib\n\tSOURCE_DIR\n\t\t"some_lib/source"\n\tCMAKE_ARGS\n\t\t"-DCMAKE_CXX_COMPILER=${{CMAKE_CXX_COMPILER}}"\n)',
+            more_info=Links.ExternalProject,
+        ),
+        RegexCheck(
+            r'specify_library_type',
+            rf"{emphasis('add_library()')} should specify the library type "
+            rf'(one of {emphasis("STATIC")}, {emphasis("SHARED")}, {emphasis("MODULE")}, '
+            + rf'{emphasis("OBJECT")}, {emphasis("INTERFACE")}, {emphasis("IMPORTED")}, {emphasis("ALIAS")}) ',
+            rf'\badd_library\s*\(({NCB})\)',
+            inner_group_must_match=r'\b(?:STATIC|SHARED|MODULE|OBJECT|INTERFACE|IMPORTED|ALIAS)\b',
+            more_info=(Links.add_library, Links.effective_modern_cmake),
         ),
-        replace_with=Links.target_compile_features,
-        more_info=(Links.CMAKE_CXX_KNOWN_FEATURES, Links.CMAKE_C_KNOWN_FEATURES),
-    ),
-    RegexCheck(
-        r'use_target_compile_options',
-        rf'compiler options should be set on a per-target basis using {emphasis("target_compile_options()")}',
-        (rf'\b(add_compile_options)\s*\({NCB}\)', rf'\bset\s*\(\s*(CMAKE_C(?:XX)?_FLAGS)\b{NCB}\)'),
-        replace_with=Links.target_compile_options,
-        more_info=Links.effective_modern_cmake,
-    ),
-    RegexCheck(
-        r'use_target_include_directories',
-        rf'include paths should be set on a per-target basis using {emphasis("target_include_directories()")}',
-        rf'\b(include_directories)\s*\({NCB}\)',
-        replace_with=Links.target_include_directories,
-        more_info=Links.effective_modern_cmake,
-    ),
-    RegexCheck(
-        r'use_target_link_libraries',
-        rf'linker paths should be inherited from library targets using {emphasis("target_link_libraries()")}',
-        rf'\b(link_directories)\s*\({NCB}\)',
-        replace_with=Links.target_link_libraries,
-        more_info=Links.effective_modern_cmake,
-    ),
-    RegexCheck(
-        r'use_threads_package',
-        rf'support for threading should be provided by linking with {emphasis("Threads::Threads")} from the {emphasis("Threads")} package',
-        rf'\btarget_link_libraries\s*\({NCB}\b(pthread)\b{NCB}\)',
-        replace_with='Threads::Threads',
-        example=r'find_package(Threads REQUIRED)\ntarget_link_libraries(my_lib PUBLIC Threads::Threads)',
-        more_info=(r'https://cmake.org/cmake/help/latest/module/FindThreads.html', Links.find_package),
-    ),
-    RegexCheck(
-        r'external_project_add_cmake_args',
-        rf"{emphasis('ExternalProject_Add()')} variable definitions specified via {emphasis('CMAKE_ARGS')} must not"
-        + rf" have a space after {emphasis('-D')} (use quotes around the entire argument if the RHS might have whitespace)",
-        rf'\bExternalProject_Add\s*\({NCB}\s+CMAKE_ARGS\s+{NCB}(-D\s+[a-zA-Z0-9_]+=){NCB}\)',
-        example='\nExternalProject_Add(\n\tsome_lib\n\tSOURCE_DIR\n\t\t"some_lib/source"\n\tCMAKE_ARGS\n\t\t"-DCMAKE_CXX_COMPILER=${{CMAKE_CXX_COMPILER}}"\n)',
-        more_info=Links.ExternalProject,
-    ),
-    RegexCheck(
-        r'specify_library_type',
-        rf"{emphasis('add_library()')} should specify the library type "
-        rf'(one of {emphasis("STATIC")}, {emphasis("SHARED")}, {emphasis("MODULE")}, '
-        + rf'{emphasis("OBJECT")}, {emphasis("INTERFACE")}, {emphasis("IMPORTED")}, {emphasis("ALIAS")}) ',
-        rf'\badd_library\s*\(({NCB})\)',
-        inner_group_must_match=r'\b(?:STATIC|SHARED|MODULE|OBJECT|INTERFACE|IMPORTED|ALIAS)\b',
-        more_info=(Links.add_library, Links.effective_modern_cmake),
     ),
 )
 
-__all__ = ['Issue', 'CHECKS']
+
+__all__ = ['Source', 'Issue', 'CHECKS']
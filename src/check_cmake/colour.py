@@ -8,12 +8,24 @@ import colorama
 
 BRIGHTNESSES = (colorama.Style.DIM, colorama.Style.NORMAL, colorama.Style.BRIGHT)
 
+# escape sequence prefixes for every (colour, brightness) combination
+_STYLE_PREFIX = {
+    (colour, brightness): rf'{getattr(colorama.Fore, colour)}{BRIGHTNESSES[brightness + 1]}'
+    for colour in dir(colorama.Fore)
+    if not colour.startswith('_')
+    for brightness in (-1, 0, 1)
+}
+
 
 def style(text, colour="WHITE", brightness=0):
     if not isinstance(text, str):
         text = rf'{text}'
-    brightness = BRIGHTNESSES[max(min(int(brightness), 1), -1) + 1]
-    return rf"{getattr(colorama.Fore, str(colour).upper())}{brightness}{text}{colorama.Style.RESET_ALL}"
+    colour = str(colour).upper()
+    brightness = max(min(int(brightness), 1), -1)
+    prefix = _STYLE_PREFIX.get((colour, brightness))
+    if prefix is None:
+        prefix = rf'{getattr(colorama.Fore, colour)}{BRIGHTNESSES[brightness + 1]}'
+    return rf"{prefix}{text}{colorama.Style.RESET_ALL}"
 
 
 def bright(text, colour="WHITE"):
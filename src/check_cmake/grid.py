@@ -4,39 +4,65 @@
 # See https://github.com/marzer/check-cmake/blob/main/LICENSE.txt for the full license text.
 # SPDX-License-Identifier: MIT
 
-from io import StringIO
-from typing import Tuple
+import bisect
+import itertools
+import re
 
 import colorama
 
+# styles and colours are stored per-cell as byte-sized codes indexing into this table; 0 means 'unset'
+_CODES = [None]
+_CODE_IDS = {None: 0}
 
-class Cell(object):
-    def __init__(self, char):
-        self.__val = str(char)
-        self.colour = None
-        self.style = None
-        assert len(self.__val) == 1
 
-    def __str__(self) -> str:
-        return self.__val
+# the sequences Grid's normalization changes the length of, and by how much
+_RESIZED_RE = re.compile(r'\r\n|\t')
+_RESIZED_BY = {'\r\n': -1, '\t': 3}
 
-    @property
-    def value(self) -> str:
-        return self.__val
+
+def _code(value) -> int:
+    if value not in _CODE_IDS:
+        assert len(_CODES) < 256
+        _CODE_IDS[value] = len(_CODES)
+        _CODES.append(value)
+    return _CODE_IDS[value]
 
 
 class Grid(object):
+    __slots__ = (
+        '__rows',
+        '__styles',
+        '__colours',
+        '__text',
+        '__row_offsets',
+        '__resized_ends',
+        '__resized_deltas',
+        '__line_num',
+        '__indent',
+    )
+
     def __init__(self, text: str, indent='', line_number=None):
-        self.__rows = []
+        # where the normalization below changes the length of the text, and the total change up to each point,
+        # so offsets into the original text can be mapped onto the normalized one (see style_range_by_offset())
+        self.__resized_ends = []
+        self.__resized_deltas = []
+        for m in _RESIZED_RE.finditer(text):
+            self.__resized_ends.append(m.end())
+            self.__resized_deltas.append(
+                (self.__resized_deltas[-1] if self.__resized_deltas else 0) + _RESIZED_BY[m[0]]
+            )
         text = text.replace('\r\n', '\n')
         text = text.replace('\r', '\n')
         text = text.replace('\t', '    ')
-        lines = text.split('\n')
-        for line in lines:
-            row = []
-            for col in line:
-                row.append(Cell(col))
-            self.__rows.append(row)
+        # one string per row, and the offset of the start of each row within the flattened text
+        self.__rows = text.split('\n')
+        self.__text = text
+        self.__row_offsets = [0]
+        for row in self.__rows[:-1]:
+            self.__row_offsets.append(self.__row_offsets[-1] + len(row) + 1)
+        # style and colour codes for each character of the flattened text (the entries for newlines are unused)
+        self.__styles = bytearray(len(text))
+        self.__colours = bytearray(len(text))
         self.line_number = line_number
         self.__indent = str(indent)
 
@@ -63,115 +89,67 @@ class Grid(object):
             emit_line_num = True
             line_num = int(self.__line_num)
             line_num_width = max(len(str(max(line_num, 0) + len(self.__rows) - 1)), 2)
-        with StringIO() as buf:
-            for row in self.__rows:
-                buf.write(self.__indent)
-                if emit_line_num:
+        R = colorama.Style.RESET_ALL
+        reset = _code(R)
+        parts = []
+        for row, offset in zip(self.__rows, self.__row_offsets):
+            styles = self.__styles[offset : offset + len(row)]
+            colours = self.__colours[offset : offset + len(row)]
+            parts.append(self.__indent)
+            if emit_line_num:
+                if current_colour is not None or current_style is not None:
+                    parts.append(R)
+                if line_num >= 0:
+                    parts.append(rf'{line_num:>{line_num_width}} | ')
+                else:
+                    parts.append(rf'{" "*line_num_width} | ')
+                if current_colour is not None:
+                    parts.append(current_colour)
+                if current_style is not None:
+                    parts.append(current_style)
+            # cells in a run with the same style and colour can only change the current state at the first
+            # cell of the run, so each run needs at most one set of escape codes and one write
+            start = 0
+            for (style, colour), run in itertools.groupby(zip(styles, colours)):
+                end = start + sum(1 for _ in run)
+                if style == reset:
                     if current_colour is not None or current_style is not None:
-                        buf.write(rf'{colorama.Style.RESET_ALL}')
-                    if line_num >= 0:
-                        buf.write(rf'{line_num:>{line_num_width}} | ')
-                    else:
-                        buf.write(rf'{" "*line_num_width} | ')
-                    if current_colour is not None:
-                        buf.write(rf'{current_colour}')
-                    if current_style is not None:
-                        buf.write(rf'{current_style}')
-                for col in row:
-                    if col.style == colorama.Style.RESET_ALL:
-                        if current_colour is not None or current_style is not None:
-                            buf.write(rf'{colorama.Style.RESET_ALL}')
-                        current_style = None
-                        current_colour = None
-                    else:
-                        if col.style is not None and col.style != current_style:
-                            current_style = col.style
-                            buf.write(rf'{current_style}')
-                        if col.colour is not None and col.colour != current_colour:
-                            current_colour = col.colour
-                            buf.write(rf'{current_colour}')
-                    buf.write(str(col))
-                line_num += 1
-                buf.write('\n')
-            return rf'{buf.getvalue().rstrip()}{colorama.Style.RESET_ALL}'
-
-    def style_range(self, first_line, first_col, last_line=None, last_col=None, style=None, colour=None):
-        assert first_line >= 1
-        if last_line is None:
-            last_line = first_line
-        if last_col is None:
-            last_col = first_col
-        assert last_line >= first_line
-        assert first_line != last_line or last_col >= first_col
+                        parts.append(R)
+                    current_style = None
+                    current_colour = None
+                else:
+                    if style and _CODES[style] != current_style:
+                        current_style = _CODES[style]
+                        parts.append(current_style)
+                    if colour and _CODES[colour] != current_colour:
+                        current_colour = _CODES[colour]
+                        parts.append(current_colour)
+                parts.append(row[start:end])
+                start = end
+            line_num += 1
+            parts.append('\n')
+        return rf'{"".join(parts).rstrip()}{R}'
+
+    def style_range_by_offset(self, start: int, end: int = None, style=None, colour=None):
+        # start and end are offsets into the text the grid was constructed from (end is exclusive, None means
+        # the end of the text)
+        assert start >= 0
+        assert end is None or end >= start
         colour = None if style == colorama.Style.RESET_ALL else colour
-        first_line -= 1
-        first_col -= 1
-        last_line -= 1
-        last_col -= 1
-        for r in range(first_line, last_line + 1):
-            if r >= len(self.__rows):
-                break
-            row = self.__rows[r]
-            for c in range(first_col if r == first_line else 0, (last_col + 1) if r == last_line else len(row)):
-                if c >= len(row):
-                    break
-                col = row[c]
-                col: Cell
-                col.style = style
-                col.colour = colour
-
-    def __iter__(self):
-        r = 1
-        for row in self.__rows:
-            if r > 1:
-                yield (r - 1, c, '\n')
-            c = 1
-            for col in row:
-                yield (r, c, col.value)
-                c += 1
-            r += 1
-
-    def find_range(self, text) -> Tuple[int, int, int, int]:
-        if text is None or not self.__rows:
-            return None
-        text = str(text)
-        if not text:
-            return None
-        text = text.replace('\r\n', '\n')
-        text = text.replace('\r', '\n')
-        text = text.replace('\t', '    ')
-
-        def compare_from_offset(start):
-            nonlocal self
-            nonlocal text
-            skipped = 0
-            i = 0
-            start_r = None
-            start_c = None
-            for r, c, val in self:
-                if skipped < start:
-                    skipped += 1
-                    continue
-                if start_r is None:
-                    start_r = r
-                    start_c = c
-                if val != text[i]:
-                    return None
-                i += 1
-                if i == len(text):
-                    return (start_r, start_c, r, c)
-            return None
-
-        self_len = sum(1 for e in self)
-        if len(text) > self_len:
-            return None
-
-        for i in range(0, self_len - len(text)):
-            result = compare_from_offset(i)
-            if result is not None:
-                return result
-
-        return None
+        start = self.__normalized_offset(start)
+        end = len(self.__text) if end is None else min(self.__normalized_offset(end), len(self.__text))
+        self.__fill(start, end, _code(style), _code(colour))
+
+    def __normalized_offset(self, offset: int) -> int:
+        i = bisect.bisect_right(self.__resized_ends, offset)
+        return offset + self.__resized_deltas[i - 1] if i else offset
+
+    def __fill(self, start: int, end: int, style: int, colour: int):
+        # ranges are contiguous in the flattened buffers, so they can be filled with one slice assignment
+        # (any newlines they span get styled too, but they're never read)
+        if start < end:
+            self.__styles[start:end] = bytes((style,)) * (end - start)
+            self.__colours[start:end] = bytes((colour,)) * (end - start)
 
 
 __all__ = ['Grid']
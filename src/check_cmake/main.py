@@ -6,6 +6,7 @@
 
 import argparse
 import multiprocessing
+import os
 import re
 import shutil
 import signal
@@ -13,6 +14,7 @@ import subprocess
 import sys
 from io import StringIO
 from pathlib import Path
+from typing import List
 
 import colorama
 
@@ -27,6 +29,18 @@ def error(text):
 
 STOP = None
 
+# \r\n or a lone \r
+_CRLF_RE = re.compile(r'\r\n?')
+
+# CMakeLists.txt or *.cmake, any case
+_CMAKE_FILE_RE = re.compile(r'cmakelists\.txt|.+\.cmake', flags=re.I | re.S)
+
+# 'ignore this line' pragmas (whitespace is [^\S\n] so a match can't run on to the next line)
+_PRAGMA_RE = re.compile(
+    r'^[^#\n]*?#[^\S\n]*(?:(?:cmake[ _-]+(?:lint|check)|(?:lint|check)[ _-]+cmake)(?:[^\S\n]|:)+(?:disable|ignore)|no(?:lint|check))[^\S\n]*$',
+    flags=re.I | re.M,
+)
+
 
 def sigint_handler(signal, frame):
     global STOP
@@ -49,7 +63,77 @@ def make_boolean_optional_arg(args: argparse.ArgumentParser, name: str, default,
         args.set_defaults(**{name: default})
 
 
-def main_impl():
+def list_directory(dir: Path) -> dict:
+    # scandir gets the type of each entry along with its name, so is_dir()/is_file() don't need to stat.
+    # the listing is read in full up-front so the directory handle isn't held open while recursing
+    with os.scandir(dir) as it:
+        return {entry.name: entry for entry in it}
+
+
+def has_dir(dir_entries: dict, name: str) -> bool:
+    return name in dir_entries and dir_entries[name].is_dir()
+
+
+def has_file(dir_entries: dict, name: str) -> bool:
+    return name in dir_entries and dir_entries[name].is_file()
+
+
+# below this many files, starting the worker processes costs more than checking the files in parallel saves
+# (especially where they're spawned rather than forked, since each one re-imports the package and rebuilds every check)
+_PARALLEL_MIN_FILES = 32
+
+
+def cpu_count() -> int:
+    # the affinity mask (where the platform has one) respects any CPU limits placed on the process, e.g. by containers
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def init_worker():
+    # Ctrl+C is handled by the main process
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def check_file(path: Path) -> List[str]:
+    # read all text
+    text = utils.read_all_text_from_file_mmap(path)
+    if '\r' in text:
+        text = _CRLF_RE.sub('\n', text)
+
+    # check for 'ignore this line' pragrams
+    ignored_lines = set()
+    line = 1
+    pos = 0
+    for m in _PRAGMA_RE.finditer(text):
+        line += text.count('\n', pos, m.start())
+        pos = m.start()
+        ignored_lines.add(line)
+
+    # check files
+    text = utils.strip_cmake_comments(text)
+    issues_in_file = []
+    issues_in_file: list[checks.Issue]
+    source = checks.Source(text)
+    for check in checks.CHECKS:
+        issues = check(path, source)
+        if issues is None:
+            continue
+        issues = list(utils.coerce_collection(issues))
+        if not issues:
+            continue
+        if ignored_lines:
+            issues = [
+                i for i in issues if not any(line in ignored_lines for line in i.span.lines(text, source.newlines))
+            ]
+        issues_in_file += issues
+
+    # sort issues by start location and format them here so only strings need to be sent back from workers
+    issues_in_file.sort(key=lambda i: i.span.start)
+    return [str(issue) for issue in issues_in_file]
+
+
+def main_impl(argv=None):
     args = argparse.ArgumentParser(
         description=r'CMake checker for C and C++ projects.',
         epilog=rf'v{VERSION_STRING} - github.com/marzer/check-cmake',
@@ -62,7 +146,7 @@ def main_impl():
     make_boolean_optional_arg(args, r"recurse", default=True, help=rf"recurse into subfolders (default: %(default)s)")
     args.add_argument(r"--limit", type=int, default=0, help="maximum errors to emit (default: %(default)s)")
     args.add_argument(r'--where', action=r'store_true', help=argparse.SUPPRESS)
-    args = args.parse_args()
+    args = args.parse_args(argv)
 
     if args.print_version:
         print(VERSION_STRING)
@@ -91,6 +175,20 @@ def main_impl():
         elif args.verbose:
             print('detected git')
 
+    # collect all the .gitignored paths up-front rather than asking git about each file individually
+    # (--directory lists wholly-ignored directories once instead of every file within them)
+    git_ignored = set()
+    if root_is_git_repo and git_ok:
+        result = subprocess.run(
+            ['git', 'ls-files', '--others', '--ignored', '--exclude-standard', '-z', '--directory'],
+            capture_output=True,
+            cwd=str(root_absolute),
+            check=False,
+        )
+        # paths are decoded the same way as DirEntry names so ones that aren't valid UTF-8 still compare equal
+        if result.returncode == 0:
+            git_ignored = set(os.fsdecode(p).rstrip('/') for p in result.stdout.split(b'\0') if p)
+
     issue_count = 0
     file_count = 0
     prev_print_was_issue = False
@@ -102,129 +200,118 @@ def main_impl():
         prev_print_was_issue = False
         print(*args)
 
-    def check_directory(dir: Path):
+    # the tree is walked up-front so the files can be checked in parallel, but everything is still reported in
+    # the order it was found; entries are either a message to print or a (path, relative path) to check
+    entries = []
+
+    def find_files(dir: Path, dir_relative: Path, dir_entries: dict = None):
         global STOP
         nonlocal args
         nonlocal root_is_git_repo
-        nonlocal issue_count
-        nonlocal file_count
-        nonlocal prev_print_was_issue
-        for item in dir.iterdir():
+        if dir_entries is None:
+            dir_entries = list_directory(dir)
+        for entry in dir_entries.values():
             if STOP.is_set():
                 break
-            item = item.resolve()
-            item_relative = item.relative_to(root_absolute)
+            # skip non-CMake files by name before anything that might need to stat them
+            # (is_dir() is answered from the directory listing on most platforms)
+            if not _CMAKE_FILE_RE.fullmatch(entry.name) and not entry.is_dir():
+                continue
+            # the relative path is carried down the walk alongside the absolute one rather than re-derived from it
+            item = dir / entry.name
+            item_relative = dir_relative / entry.name
 
             # check permissions
             try:
-                item.stat()
+                entry.stat()
             except PermissionError:
                 if args.verbose:
-                    print_ex(rf'[--] {item_relative} skipped (insufficient permissions)')
+                    entries.append(rf'[--] {item_relative} skipped (insufficient permissions)')
                 continue
 
             # subdirectories
-            if item.is_dir():
+            if entry.is_dir():
                 if not args.recurse:
                     continue
                 try:
+                    # read the subdirectory once and look for the build folder sentinels by name,
+                    # rather than probing for each of them with a separate syscall
+                    children = list_directory(item)
                     # skip git submodules
-                    if root_is_git_repo and (item / ".git").exists():
+                    if root_is_git_repo and '.git' in children:
                         if args.verbose:
-                            print_ex(rf'[--] {item_relative} skipped (git submodule)')
+                            entries.append(rf'[--] {item_relative} skipped (git submodule)')
                         continue
                     # skip meson build folders
                     if (
-                        (item / 'meson-info').is_dir()
-                        or (item / 'meson-logs').is_dir()
-                        or (item / 'meson-private').is_dir()
+                        has_dir(children, 'meson-info')
+                        or has_dir(children, 'meson-logs')
+                        or has_dir(children, 'meson-private')
                     ):
                         if args.verbose:
-                            print_ex(rf'[--] {item_relative} skipped (meson build folder)')
+                            entries.append(rf'[--] {item_relative} skipped (meson build folder)')
                         continue
                     # skip cmake build folders
-                    if (item / 'CMakeCache.txt').is_file():
+                    if has_file(children, 'CMakeCache.txt'):
                         if args.verbose:
-                            print_ex(rf'[--] {item_relative} skipped (CMake build folder)')
+                            entries.append(rf'[--] {item_relative} skipped (CMake build folder)')
                         continue
                     # skip ninja build folders
-                    if (item / 'build.ninja').is_file():
+                    if has_file(children, 'build.ninja'):
                         if args.verbose:
-                            print_ex(rf'[--] {item_relative} skipped (ninja build folder)')
+                            entries.append(rf'[--] {item_relative} skipped (ninja build folder)')
                         continue
                     # skip misc build folders
-                    if (item / 'compile_commands.json').is_file():
+                    if has_file(children, 'compile_commands.json'):
                         if args.verbose:
-                            print_ex(rf'[--] {item_relative} skipped (build folder)')
+                            entries.append(rf'[--] {item_relative} skipped (build folder)')
                         continue
                     # skip conan database folders
-                    if (item / '.conan.db').is_file():
+                    if has_file(children, '.conan.db'):
                         if args.verbose:
-                            print_ex(rf'[--] {item_relative} skipped (conan database)')
+                            entries.append(rf'[--] {item_relative} skipped (conan database)')
                         continue
                 except PermissionError:
                     if args.verbose:
-                        print_ex(rf'[--] {item_relative} skipped (insufficient permissions)')
+                        entries.append(rf'[--] {item_relative} skipped (insufficient permissions)')
                     continue
-                check_directory(item)
+                find_files(item, item_relative, children)
                 continue
 
             # non-files
-            if not item.is_file():
-                continue
-
-            # everything else is a file; skip non-CMake files
-            if not (item.name.lower() == 'cmakelists.txt' or item.suffix.lower() == '.cmake'):
+            if not entry.is_file():
                 continue
 
             # skip .gitignored files
-            if root_is_git_repo and git_ok:
-                if (
-                    subprocess.run(
-                        ['git', 'check-ignore', '--quiet', str(item)],
-                        capture_output=True,
-                        encoding='utf-8',
-                        cwd=str(dir),
-                        check=False,
-                    ).returncode
-                    == 0
-                ):
+            if git_ignored:
+                if any(p.as_posix() in git_ignored for p in (item_relative, *item_relative.parents)):
                     if args.verbose:
-                        print_ex(rf'[--] {item_relative} skipped (.gitignore)')
+                        entries.append(rf'[--] {item_relative} skipped (.gitignore)')
                     continue
 
-            # read all text
-            file_count += 1
-            text = utils.read_all_text_from_file(item).replace('\r\n', '\n').replace('\r', '\n')
-
-            # check for 'ignore this line' pragrams
-            ignored_lines = 0
-            lines = text.split('\n')
-            for i, line in zip(range(len(lines)), lines):
-                if re.fullmatch(
-                    r'^[^#]*?#\s*(?:(?:cmake[ _-]+(?:lint|check)|(?:lint|check)[ _-]+cmake)[:\s]+(?:disable|ignore)|no(?:lint|check))\s*$',
-                    line,
-                    flags=re.I,
-                ):
-                    ignored_lines |= 1 << (i + 1)
-
-            # check files
-            text = utils.strip_cmake_comments(text)
-            issues_in_file = []
-            issues_in_file: list[checks.Issue]
-            for check in checks.CHECKS:
-                issues = check(item, text)
-                if issues is None:
-                    continue
-                issues = list(utils.coerce_collection(issues))
-                if not issues:
-                    continue
-                if ignored_lines:
-                    issues = [i for i in issues if (i.span.line_mask(text) & ignored_lines) == 0]
-                issues_in_file += issues
+            entries.append((item, item_relative))
 
-            # sort issues by start location and print
-            issues_in_file.sort(key=lambda i: i.span.start)
+    find_files(root_absolute, Path())
+
+    files = [entry[0] for entry in entries if isinstance(entry, tuple)]
+    processes = min(cpu_count(), len(files)) if len(files) >= _PARALLEL_MIN_FILES else 1
+    pool = None
+    if processes > 1:
+        pool = multiprocessing.Pool(processes, initializer=init_worker)
+    try:
+        # imap (rather than imap_unordered) so results come back in the same order as the files were found
+        if pool is not None:
+            results = pool.imap(check_file, files, chunksize=max(len(files) // (processes * 4), 1))
+        else:
+            results = map(check_file, files)
+        for entry in entries:
+            if STOP.is_set():
+                break
+            if not isinstance(entry, tuple):
+                print_ex(entry)
+                continue
+            file_count += 1
+            issues_in_file = next(results)
             for issue in issues_in_file:
                 if not prev_print_was_issue:
                     print('')
@@ -232,12 +319,16 @@ def main_impl():
                 prev_print_was_issue = True
                 issue_count += 1
                 if args.limit > 0 and issue_count >= args.limit > 0:
-                    print_ex(f"reached error limit, stopping.")
-                    return
+                    break
+            if args.limit > 0 and issue_count >= args.limit > 0:
+                print_ex(f"reached error limit, stopping.")
+                break
             if not issues_in_file and args.verbose:
-                print_ex(rf'[OK] {item_relative}')
-
-    check_directory(args.root)
+                print_ex(rf'[OK] {entry[1]}')
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
 
     print_ex(
         rf'found {issue_count} error{"" if issue_count == 1 else "s"} in {file_count} file{"" if file_count == 1 else "s"}.'
@@ -245,12 +336,12 @@ def main_impl():
     return issue_count
 
 
-def main():
+def main(argv=None):
     signal.signal(signal.SIGINT, sigint_handler)
     colorama.init()
     result = None
     try:
-        result = main_impl()
+        result = main_impl(argv)
         if result is None:
             sys.exit(0)
         elif isinstance(result, int):
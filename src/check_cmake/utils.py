@@ -4,64 +4,77 @@
 # See https://github.com/marzer/check-cmake/blob/main/LICENSE.txt for the full license text.
 # SPDX-License-Identifier: MIT
 
-from io import StringIO
-from typing import Tuple
+import bisect
+import mmap
+import os
+import re
+from typing import List, Tuple
 
 from misk import *
 
+_NEWLINE = re.compile(r'\n')
+_COMMENT = re.compile(r'#[^\n]*')
 
-def calc_line_and_column(text: str, pos: int) -> Tuple[int, int]:
+
+def find_newlines(text: str) -> List[int]:
+    return [m.start() for m in _NEWLINE.finditer(text)]
+
+
+def calc_line_and_column(text: str, pos: int, newlines: List[int] = None) -> Tuple[int, int]:
     assert 0 <= pos <= len(text)
-    line = 0
-    col = 0
-    for i in range(min(len(text), pos)):
-        if text[i] == '\n':
-            line += 1
-            col = 0
-        else:
-            col += 1
-    return (line + 1, col + 1)
-
-
-def find_first_char_on_line(text: str, pos: int) -> int:
+    if newlines is None:
+        return (text.count('\n', 0, pos) + 1, pos - text.rfind('\n', 0, pos))
+    line = bisect.bisect_left(newlines, pos)
+    line_start = newlines[line - 1] + 1 if line else 0
+    return (line + 1, pos - line_start + 1)
+
+
+def find_first_char_on_line(text: str, pos: int, newlines: List[int] = None) -> int:
     assert 0 <= pos <= len(text)
     if text:
         pos = max(min(len(text) - 1, pos), 0)
         assert text[pos] != '\n'
-        for i in range(pos, -1, -1):
-            if text[i] == '\n':
-                return i + 1
+        if newlines is None:
+            return text.rfind('\n', 0, pos) + 1
+        line = bisect.bisect_left(newlines, pos)
+        return newlines[line - 1] + 1 if line else 0
     return 0
 
 
-def find_last_char_on_line(text: str, pos: int) -> int:
+def find_last_char_on_line(text: str, pos: int, newlines: List[int] = None) -> int:
     assert 0 <= pos <= len(text)
     if text:
         pos = max(min(len(text) - 1, pos), 0)
         assert text[pos] != '\n'
-        for i in range(pos, len(text)):
-            if text[i] == '\n':
-                return i - 1
-        return len(text) - 1
+        if newlines is None:
+            end = text.find('\n', pos)
+            return (end if end != -1 else len(text)) - 1
+        line = bisect.bisect_left(newlines, pos)
+        return newlines[line] - 1 if line < len(newlines) else len(text) - 1
     return 0
 
 
+def read_all_text_from_file_mmap(path) -> str:
+    # decodes straight out of a memory-mapped view of the file, so there's no intermediate copy of its bytes and
+    # no trip through a buffered text reader. newlines are *not* normalized (unlike read_all_text_from_file())
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            return str(view, encoding='utf-8')
+
+
 def strip_cmake_comments(text: str) -> str:
     # todo: this currently does not support cmake's multi-line bracket syntax,
     # nor does it take strings into account (so a # in a string will count as a comment)
-    in_comment = False
-    with StringIO() as buf:
-        for c in text:
-            if in_comment:
-                if c == '\n':
-                    buf.write('\n')
-                    in_comment = False
-            else:
-                if c == '#':
-                    in_comment = True
-                else:
-                    buf.write(c)
-        return buf.getvalue()
-
-
-__all__ = ['calc_line_and_column', 'find_first_char_on_line', 'find_last_char_on_line', 'strip_cmake_comments']
+    return _COMMENT.sub('', text)
+
+
+__all__ = [
+    'find_newlines',
+    'calc_line_and_column',
+    'find_first_char_on_line',
+    'find_last_char_on_line',
+    'read_all_text_from_file_mmap',
+    'strip_cmake_comments',
+]
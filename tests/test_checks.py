@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# This file is a part of marzer/check-cmake and is subject to the the terms of the MIT license.
+# Copyright (c) Mark Gillard <mark.gillard@outlook.com.au>
+# See https://github.com/marzer/check-cmake/blob/main/LICENSE.txt for the full license text.
+# SPDX-License-Identifier: MIT
+
+# run with: python -m unittest discover tests
+
+import re
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from check_cmake import checks
+
+SOURCE_PATH = Path('CMakeLists.txt')
+
+# (check, text, expected issue count); the non-ASCII cases are ones RE2 (whose \b, \s and \w are ASCII-only) or PCRE2
+# (whose Unicode classes differ from python's for combining marks and U+180E) disagree with re about, so each is
+# paired with an ASCII case that goes through RE2 or PCRE2 when either is installed.
+# \x0b and \x1c-\x1f are ASCII, but only python's \s matches all of them
+CASES = (
+    (r'use_target_include_directories', 'include_directories(x)\n', 1),
+    (r'use_target_include_directories', 'include_directories (x)\n', 1),
+    (r'use_target_include_directories', 'include_directories\x0b(x)\n', 1),
+    (r'use_target_include_directories', 'include_directories\x1c(x)\n', 1),
+    (r'use_target_include_directories', 'include_directories\x1f(x)\n', 1),
+    (r'use_target_include_directories', 'include_directories\x1c(é)\n', 1),
+    (r'use_target_include_directories', 'include_directories\u180e(x)\n', 0),
+    (r'specify_library_type', 'add_library(x STATIC)\n', 0),
+    (r'specify_library_type', 'add_library(x éSTATIC)\n', 1),
+    (r'specify_library_type', 'add_library(x STATIC\u0301)\n', 0),
+    (r'use_threads_package', 'target_link_libraries(x PRIVATE pthread)\n', 1),
+    (r'use_threads_package', 'target_link_libraries(x PRIVATE pthreadé)\n', 0),
+    (r'use_threads_package', 'target_link_libraries(x PRIVATE pthread\u0301)\n', 1),
+)
+
+
+def regex_checks():
+    for check in checks.CHECKS:
+        if isinstance(check, checks.CompositeRegexCheck):
+            yield from check.members
+        elif isinstance(check, checks.RegexCheck):
+            yield check
+
+
+def find_check(name: str) -> checks.RegexCheck:
+    for check in regex_checks():
+        if check.name == name:
+            return check
+    raise KeyError(name)
+
+
+class TestRegexChecks(unittest.TestCase):
+    def test_cases(self):
+        for name, text, expected in CASES:
+            with self.subTest(check=name, text=text):
+                issues = find_check(name)(SOURCE_PATH, checks.Source(text))
+                self.assertEqual(len(issues), expected)
+
+    @unittest.skipIf(checks.re2 is None and checks.pcre2 is None, 'neither google-re2 nor pcre2 is installed')
+    def test_engines_agree_on_ascii(self):
+        for check in regex_checks():
+            for pattern_string in check._pattern_strings:
+                unicode = checks._compile(pattern_string, flags=check._flags)
+                for engine in (checks._compile_re2, checks._compile_pcre2):
+                    ascii = engine(pattern_string) if not check._flags & ~re.DOTALL else None
+                    if ascii is None:
+                        continue
+                    for _, text, _ in CASES:
+                        if not text.isascii():
+                            continue
+                        with self.subTest(check=check.name, engine=engine.__name__, pattern=pattern_string, text=text):
+                            self.assertEqual(
+                                [m.span() for m in ascii.finditer(text)], [m.span() for m in unicode.finditer(text)]
+                            )
+
+    def test_composite_non_ascii(self):
+        # a check with flags beyond DOTALL stays on re, but the composite's prefilter must not rule it out either
+        check = checks.RegexCheck(r'test_composite_non_ascii', r'desc', r'\b(foo)\s*\(', flags=re.I)
+        composite = checks.CompositeRegexCheck(check)
+        for text in ('FOO (bar)\n', 'FOO\u00a0(bar)\n', 'FOO\x0b(bar)\n', 'FOO\x1c(bar)\n'):
+            with self.subTest(text=text):
+                self.assertEqual(len(check(SOURCE_PATH, checks.Source(text))), 1)
+                self.assertEqual(len(composite(SOURCE_PATH, checks.Source(text))), 1)
+
+    def test_composite_unspliceable(self):
+        # patterns with a top-level | or a numbered backreference can't be pasted into the composite's union as-is
+        members = (
+            checks.RegexCheck(r'test_composite_branch', r'desc', r'\bfoo|bar'),
+            checks.RegexCheck(r'test_composite_backref', r'desc', r'\b(x)y\1'),
+        )
+        composite = checks.CompositeRegexCheck(*members)
+        source = checks.Source('xbar xyx foo\n')
+        self.assertEqual(
+            [i.span.start for i in composite(SOURCE_PATH, source)],
+            [i.span.start for m in members for i in m(SOURCE_PATH, source)],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()